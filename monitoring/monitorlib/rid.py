@@ -102,6 +102,8 @@ class RIDAuthData(ImplicitDict):
 
 
 class RIDFlightDetails(ImplicitDict):
+  __slots__ = ()
+
   id: str
   operator_id: Optional[str]
   operator_location: Optional[LatLngPoint]
@@ -112,6 +114,8 @@ class RIDFlightDetails(ImplicitDict):
 
 
 class RIDAircraftPosition(ImplicitDict):
+  __slots__ = ()
+
   lat: float
   lng: float
   alt: float
@@ -122,11 +126,15 @@ class RIDAircraftPosition(ImplicitDict):
 
 
 class RIDHeight(ImplicitDict):
+  __slots__ = ()
+
   distance: float
   reference: str
 
 
 class RIDAircraftState(ImplicitDict):
+  __slots__ = ()
+
   timestamp: StringBasedDateTime
   timestamp_accuracy: float
   operational_status: Optional[str]
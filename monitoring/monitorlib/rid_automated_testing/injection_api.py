@@ -20,6 +20,8 @@ class OperatorLocation(ImplicitDict):
 
 class TestFlightDetails(ImplicitDict):
     ''' A object to hold the remote ID Details,  and a date time after which the USS should submit the flight details, it matches the TestFlightDetails in the injection interface, for more details see: https://github.com/interuss/dss/blob/master/interfaces/automated-testing/rid/injection.yaml#L158 '''
+    __slots__ = ()
+
     effective_after: StringBasedDateTime # ISO 8601 datetime string
     details: rid.RIDFlightDetails
 
@@ -27,6 +29,8 @@ class TestFlightDetails(ImplicitDict):
 class TestFlight(ImplicitDict):
     ''' Represents the data necessary to inject a single, complete test flight into a Remote ID Service Provider under test; matches TestFlight in injection interface '''
 
+    __slots__ = ()
+
     injection_id: str
     telemetry: List[rid.RIDAircraftState]
     details_responses : List[TestFlightDetails]
@@ -97,6 +101,8 @@ class TestFlight(ImplicitDict):
 
 
 class CreateTestParameters(ImplicitDict):
+    __slots__ = ()
+
     requested_flights: List[TestFlight]
 
     def get_span(self) -> Tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
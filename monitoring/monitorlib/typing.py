@@ -1,5 +1,6 @@
 import arrow
 import datetime
+import functools
 from typing import get_args, get_origin, get_type_hints, Dict, Literal, Optional, Type, Union
 
 import pytimeparse
@@ -69,14 +70,20 @@ class ImplicitDict(dict):
       def __init__(self, **kwargs):
         self.e = 5
         super(ImplicitDict, self).__init__(**kwargs)
+
+  Subclasses that are instantiated in large numbers may declare
+  `__slots__ = ()`; since all field values live in the underlying dict, this
+  avoids allocating an unused per-instance `__dict__`.
   """
 
+  __slots__ = ()
+
   @classmethod
   def parse(cls, source: Dict, parse_type: Type):
     if not isinstance(source, dict):
       raise ValueError('Expected to find dictionary data to populate {} object but instead found {} type'.format(parse_type.__name__, type(source).__name__))
     kwargs = {}
-    hints = get_type_hints(parse_type)
+    hints = _get_type_hints(parse_type)
     for key, value in source.items():
       if key in hints:
         # This entry has an explicit type
@@ -169,6 +176,12 @@ class ImplicitDict(dict):
     return field_name in self and self[field_name] is not None
 
 
+@functools.lru_cache(maxsize=None)
+def _get_type_hints(parse_type: Type) -> Dict[str, Type]:
+  """Resolve the type hints of parse_type once rather than on every parse."""
+  return get_type_hints(parse_type)
+
+
 def _parse_value(value, value_type: Type):
   generic_type = get_origin(value_type)
   if generic_type:
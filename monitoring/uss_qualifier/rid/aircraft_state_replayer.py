@@ -1,4 +1,5 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from monitoring.monitorlib.auth import make_auth_adapter
 from monitoring.monitorlib.infrastructure import UTMClientSession
 import json, os
@@ -14,12 +15,34 @@ from monitoring.monitorlib.rid_automated_testing.injection_api import (
     SCOPE_RID_QUALIFIER_INJECT,
     ChangeTestResponse,
 )
-from monitoring.monitorlib.typing import ImplicitDict
+from monitoring.monitorlib.typing import ImplicitDict, StringBasedDateTime
 import arrow
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from typing import List
+from typing import List, Optional, Tuple
 from monitoring.uss_qualifier.rid.utils import RIDQualifierTestConfiguration
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_STATUS_MESSAGES = {
+    401: "Unauthorized; access token was missing or invalid",
+    403: "Forbidden; access token did not grant the required scope",
+    404: "Injection endpoint not found",
+    409: "Test already exists",
+    413: "Test payload too large",
+}
+
+
+def _load_full_flight_record(file: str) -> FullFlightRecord:
+    with open(file, "rb") as f:
+        raw = orjson.loads(f.read()) if orjson else json.load(f)
+    return ImplicitDict.parse(raw, FullFlightRecord)
+
 
 def get_full_flight_records(aircraft_states_directory: Path) -> List[FullFlightRecord]:
     """Gets full flight records from the specified directory if they exist"""
@@ -31,22 +54,19 @@ def get_full_flight_records(aircraft_states_directory: Path) -> List[FullFlightR
             )
         )
 
-    all_files = os.listdir(aircraft_states_directory)
-    files = [
-        os.path.join(aircraft_states_directory, f)
-        for f in all_files
-        if os.path.isfile(os.path.join(aircraft_states_directory, f))
-    ]
+    with os.scandir(aircraft_states_directory) as entries:
+        files = [entry.path for entry in entries if entry.is_file()]
 
     if not files:
         raise ValueError(
             "There are no states in the states directory, create states first using the simulator/flight_state module."
         )
 
-    flight_records: List[FullFlightRecord] = []
-    for file in files:
-        with open(file, "r") as f:
-            flight_records.append(ImplicitDict.parse(json.load(f), FullFlightRecord))
+    # Each file is independent, so overlap the disk reads and parsing
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        flight_records: List[FullFlightRecord] = list(
+            executor.map(_load_full_flight_record, files)
+        )
 
     return flight_records
 
@@ -88,9 +108,11 @@ class TestBuilder:
 
             timestamp_offset = test_start_time - disk_reference_time
 
-            for telemetry_id, flight_telemetry in enumerate(flight_record.states):
-                timestamp = arrow.get(flight_telemetry.timestamp) + timestamp_offset
-                flight_telemetry.timestamp = timestamp.isoformat()
+            for flight_telemetry in flight_record.states:
+                # Timestamps parsed from disk already carry their datetime
+                t = flight_telemetry.timestamp
+                t = t.datetime if isinstance(t, StringBasedDateTime) else arrow.get(t)
+                flight_telemetry.timestamp = (t + timestamp_offset).isoformat()
 
             test_flight_details = TestFlightDetails(
                 effective_after=test_start_isoformat,
@@ -119,17 +141,51 @@ class TestHarness:
         self._base_url = injection_base_url
         self.uss_session = UTMClientSession(injection_base_url, auth_adapter)
 
+        # Reuse pooled connections for all submissions through this harness.
+        # Only retry failures to connect: a test PUT whose response was lost
+        # may already have been applied, and retrying it would yield a 409.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5),
+        )
+        self.uss_session.mount("https://", adapter)
+        # Also mount for http:// because injection targets are not required to
+        # use TLS; e.g., run_locally_rid.sh injects into a plain HTTP mock USS
+        self.uss_session.mount("http://", adapter)
+
     def submit_test(
         self, payload: CreateTestParameters, test_id: str, setup: reports.Setup
     ) -> List[TestFlight]:
+        response, query = self.put_test(payload, test_id)
+        setup.injections.append(query)
+        return self.get_injected_flights(response, test_id)
+
+    def put_test(
+        self, payload: CreateTestParameters, test_id: str
+    ) -> Tuple[requests.Response, fetch.Query]:
+        """Submits the test payload without recording or interpreting the response"""
         injection_path = "/tests/{}".format(test_id)
 
+        if orjson:
+            # Serialize natively to bytes rather than via the requests json encoder
+            body = dict(
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+            )
+        else:
+            body = dict(json=payload)
+
         initiated_at = datetime.datetime.utcnow()
         response = self.uss_session.put(
-            url=injection_path, json=payload, scope=SCOPE_RID_QUALIFIER_INJECT
+            url=injection_path, scope=SCOPE_RID_QUALIFIER_INJECT, **body
         )
-        setup.injections.append(fetch.describe_query(response, initiated_at))
+        return (response, fetch.describe_query(response, initiated_at))
 
+    def get_injected_flights(
+        self, response: requests.Response, test_id: str
+    ) -> List[TestFlight]:
+        """Extracts the injected flights from a response to put_test"""
         if response.status_code == 200:
             changed_test: ChangeTestResponse = ImplicitDict.parse(
                 response.json(), ChangeTestResponse
@@ -137,11 +193,60 @@ class TestHarness:
             print("New test with ID %s created" % test_id)
             return changed_test.injected_flights
         else:
+            message = _STATUS_MESSAGES.get(response.status_code, "Unexpected response")
             raise RuntimeError(
-                "Error {} submitting test ID {} to {}: {}".format(
+                "Error {} ({}) submitting test ID {} to {}: {}".format(
                     response.status_code,
+                    message,
                     test_id,
                     self._base_url,
                     response.content.decode("utf-8"),
                 )
             )
+
+
+def submit_tests(
+    harnesses: List[TestHarness],
+    payloads: List[CreateTestParameters],
+    test_id: str,
+    setup: reports.Setup,
+    max_concurrency: int = 8,
+) -> List[List[TestFlight]]:
+    """Submits each payload to its corresponding harness concurrently.
+
+    The i-th payload is submitted to the i-th harness; any payloads beyond the
+    number of harnesses are ignored.  Injected flights are returned, and
+    injection queries are recorded in setup, in the same order as the
+    harnesses.  All submissions are allowed to complete before the first
+    error (if any) is raised.
+    """
+    if len(payloads) < len(harnesses):
+        raise ValueError(
+            "There are not enough payloads ({}) to submit to the specified harnesses ({})".format(
+                len(payloads), len(harnesses)
+            )
+        )
+    max_workers = max(1, min(max_concurrency, len(harnesses)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(harness.put_test, payload, test_id)
+            for harness, payload in zip(harnesses, payloads)
+        ]
+
+    # Record queries and interpret responses on this thread, in harness order
+    first_error: Optional[BaseException] = None
+    results: List[List[TestFlight]] = []
+    for harness, future in zip(harnesses, futures):
+        error = future.exception()
+        if error is None:
+            response, query = future.result()
+            setup.injections.append(query)
+            try:
+                results.append(harness.get_injected_flights(response, test_id))
+            except Exception as e:
+                error = e
+        if error is not None and first_error is None:
+            first_error = error
+    if first_error is not None:
+        raise first_error
+    return results
@@ -0,0 +1,101 @@
+"""Unit tests for the aircraft_state_replayer module using pytest.
+
+Testing can be invoked from the command line using:
+`pytest [test_*|*_test.py file/filepath]`
+"""
+
+import time
+
+import pytest
+
+from monitoring.uss_qualifier.rid import aircraft_state_replayer
+
+
+class FakeSetup(object):
+    def __init__(self):
+        self.injections = []
+
+
+class FakeHarness(object):
+    """Stands in for TestHarness, responding after a delay"""
+
+    def __init__(
+        self, name: str, delay: float, fail: bool = False, bad_body: bool = False
+    ):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.bad_body = bad_body
+        self.finished = False
+        self.submitted_payload = None
+
+    def put_test(self, payload, test_id):
+        time.sleep(self.delay)
+        self.submitted_payload = payload
+        self.finished = True
+        return (self.name, "query_" + self.name)
+
+    def get_injected_flights(self, response, test_id):
+        if self.fail:
+            raise RuntimeError("Error submitting to " + self.name)
+        if self.bad_body:
+            raise ValueError("Invalid response body from " + self.name)
+        return ["flight_" + response]
+
+
+def test_submit_tests_ignores_extra_payloads():
+    harnesses = [FakeHarness("a", 0), FakeHarness("b", 0)]
+    setup = FakeSetup()
+    results = aircraft_state_replayer.submit_tests(
+        harnesses, ["p0", "p1", "p2", "p3"], "test", setup
+    )
+    assert results == [["flight_a"], ["flight_b"]]
+    assert [h.submitted_payload for h in harnesses] == ["p0", "p1"]
+
+
+def test_submit_tests_rejects_too_few_payloads():
+    with pytest.raises(ValueError):
+        aircraft_state_replayer.submit_tests(
+            [FakeHarness("a", 0), FakeHarness("b", 0)], ["p0"], "test", FakeSetup()
+        )
+
+
+def test_submit_tests_preserves_harness_order():
+    # Later harnesses respond first
+    harnesses = [FakeHarness("a", 0.2), FakeHarness("b", 0.1), FakeHarness("c", 0)]
+    setup = FakeSetup()
+    results = aircraft_state_replayer.submit_tests(
+        harnesses, ["p0", "p1", "p2"], "test", setup
+    )
+    assert results == [["flight_a"], ["flight_b"], ["flight_c"]]
+    assert setup.injections == ["query_a", "query_b", "query_c"]
+
+
+def test_submit_tests_raises_after_all_submissions_finish():
+    # The failing harness responds first; the others are still in flight
+    harnesses = [
+        FakeHarness("a", 0.1),
+        FakeHarness("b", 0, fail=True),
+        FakeHarness("c", 0.2),
+    ]
+    setup = FakeSetup()
+    with pytest.raises(RuntimeError, match="Error submitting to b"):
+        aircraft_state_replayer.submit_tests(
+            harnesses, ["p0", "p1", "p2"], "test", setup
+        )
+    assert all(h.finished for h in harnesses)
+    assert setup.injections == ["query_a", "query_b", "query_c"]
+
+
+def test_submit_tests_defers_response_parsing_errors():
+    harnesses = [
+        FakeHarness("a", 0),
+        FakeHarness("b", 0, bad_body=True),
+        FakeHarness("c", 0.1, fail=True),
+    ]
+    setup = FakeSetup()
+    with pytest.raises(ValueError, match="Invalid response body from b"):
+        aircraft_state_replayer.submit_tests(
+            harnesses, ["p0", "p1", "p2"], "test", setup
+        )
+    assert setup.injections == ["query_a", "query_b", "query_c"]
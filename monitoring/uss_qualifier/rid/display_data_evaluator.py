@@ -1,9 +1,10 @@
 import datetime
 import json
 import time
-from typing import List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import arrow
+import numpy as np
 import s2sphere
 
 from monitoring.monitorlib import fetch, geo
@@ -17,51 +18,84 @@ from monitoring.uss_qualifier.rid.utils import (
 )
 from monitoring.monitorlib.rid_automated_testing import observation_api
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _FlightCache(NamedTuple):
+    """Per-flight values that do not change over the course of an evaluation"""
+
+    flight_id: str
+    t_min: datetime.datetime
+    t_max: datetime.datetime
+    uss_name: str
+
+
+def _dumps_indented(obj) -> str:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
+def _diagonal_m(
+    lat_min: float, lng_min: float, lat_max: float, lng_max: float
+) -> float:
+    c1 = s2sphere.LatLng.from_degrees(lat_min, lng_min)
+    c2 = s2sphere.LatLng.from_degrees(lat_max, lng_max)
+    return c1.get_distance(c2).degrees * geo.EARTH_CIRCUMFERENCE_KM * 1000 / 360
+
 
 class RIDSystemObserver(object):
     def __init__(self, name: str, session: UTMClientSession, rid_version: RIDVersion):
         self.session = session
         self.name = name
         self.rid_version = rid_version
+        self._read_scope = rid_version.read_scope
 
     def observe_system(
         self, rect: s2sphere.LatLngRect
     ) -> Tuple[Optional[observation_api.GetDisplayDataResponse], fetch.Query]:
         initiated_at = datetime.datetime.utcnow()
+        lo = rect.lo()
+        hi = rect.hi()
         resp = self.session.get(
-            "/display_data?view={},{},{},{}".format(
-                rect.lo().lat().degrees,
-                rect.lo().lng().degrees,
-                rect.hi().lat().degrees,
-                rect.hi().lng().degrees,
-            ),
-            scope=self.rid_version.read_scope,
+            f"/display_data?view={lo.lat().degrees},{lo.lng().degrees},{hi.lat().degrees},{hi.lng().degrees}",
+            scope=self._read_scope,
         )
+        # describe_query already decodes the response body, so parse from that
+        query = fetch.describe_query(resp, initiated_at)
         try:
             result = (
-                ImplicitDict.parse(resp.json(), observation_api.GetDisplayDataResponse)
-                if resp.status_code == 200
+                ImplicitDict.parse(
+                    query.json_result, observation_api.GetDisplayDataResponse
+                )
+                if query.status_code == 200
                 else None
             )
         except ValueError as e:
             print("Error parsing observation response: {}".format(e))
             result = None
-        return (result, fetch.describe_query(resp, initiated_at))
+        return (result, query)
 
     def observe_flight_details(
         self, flight_id: str
     ) -> Tuple[Optional[observation_api.GetDetailsResponse], fetch.Query]:
         initiated_at = datetime.datetime.utcnow()
-        resp = self.session.get("/display_data/{}".format(flight_id))
+        resp = self.session.get(f"/display_data/{flight_id}")
+        query = fetch.describe_query(resp, initiated_at)
         try:
             result = (
-                ImplicitDict.parse(resp.json(), observation_api.GetDetailsResponse)
-                if resp.status_code == 200
+                ImplicitDict.parse(
+                    query.json_result, observation_api.GetDetailsResponse
+                )
+                if query.status_code == 200
                 else None
             )
         except ValueError:
             result = None
-        return (result, fetch.describe_query(resp, initiated_at))
+        return (result, query)
 
 
 class RIDObservationEvaluator(object):
@@ -86,78 +120,122 @@ class RIDObservationEvaluator(object):
         self._config = config
         self._rid_version = rid_version
 
+        # Parse each telemetry timestamp exactly once, and summarize the
+        # invariant properties of each injected flight.  Flights without any
+        # telemetry can never be observed, so they are omitted.
+        flights_with_telemetry = [
+            injected_flight
+            for injected_flight in injected_flights
+            if injected_flight.flight.telemetry
+        ]
+        if not flights_with_telemetry:
+            raise ValueError(
+                "Cannot evaluate system: none of the {} injected flights contain any telemetry".format(
+                    len(injected_flights)
+                )
+            )
+        telemetry_times = [
+            [arrow.get(t.timestamp).datetime for t in injected_flight.flight.telemetry]
+            for injected_flight in flights_with_telemetry
+        ]
+        self._flight_caches: Dict[int, _FlightCache] = {}
+        for injected_flight, times in zip(flights_with_telemetry, telemetry_times):
+            # TODO: Choose appropriate details rather than first
+            details = injected_flight.flight.details_responses[0].details
+            self._flight_caches[id(injected_flight)] = _FlightCache(
+                flight_id=details.id,
+                t_min=min(times),
+                t_max=max(times),
+                uss_name=injected_flight.uss.name,
+            )
+        self._t_end_global = max(cache.t_max for cache in self._flight_caches.values())
+
+        # Store each flight's telemetry as time-sorted arrays, with flights
+        # ordered by (t_min, t_max), so query rects only touch flights and
+        # points within the relevant time window
+        flight_arrays = []
+        for injected_flight, times in zip(flights_with_telemetry, telemetry_times):
+            epoch = np.array([t.timestamp() for t in times], dtype=np.float64)
+            order = np.argsort(epoch, kind="stable")
+            telemetry = injected_flight.flight.telemetry
+            lats = np.array([t.position.lat for t in telemetry], dtype=np.float64)
+            lngs = np.array([t.position.lng for t in telemetry], dtype=np.float64)
+            flight_arrays.append((epoch[order], lats[order], lngs[order]))
+        flight_arrays.sort(key=lambda arrays: (arrays[0][0], arrays[0][-1]))
+        self._flight_times = [times for times, _, _ in flight_arrays]
+        self._flight_lats = [lats for _, lats, _ in flight_arrays]
+        self._flight_lngs = [lngs for _, _, lngs in flight_arrays]
+        self._flight_tmin = np.array(
+            [times[0] for times in self._flight_times], dtype=np.float64
+        )
+        self._flight_tmax = np.array(
+            [times[-1] for times in self._flight_times], dtype=np.float64
+        )
+
+        # Center of all injected data, used before any flight data exists
+        self._lat_center = float(np.concatenate(self._flight_lats).mean())
+        self._lng_center = float(np.concatenate(self._flight_lngs).mean())
+
     def _get_query_rect(
         self,
         t: datetime.datetime,
     ) -> s2sphere.LatLngRect:
-        data_exists = False
-        lat_min = 90
-        lng_min = 360
-        lat_max = -90
-        lng_max = -360
-
         # Find the bounds of all relevant points
         t_min = (
             t
             - self._rid_version.realtime_period
             - self._config.max_propagation_latency.timedelta
-        )
-        t_max = t
-        for injected_flight in self._injected_flights:
-            for telemetry in injected_flight.flight.telemetry:
-                t = arrow.get(telemetry.timestamp).datetime
-                if t_min <= t <= t_max:
-                    data_exists = True
-                    lat_min = min(lat_min, telemetry.position.lat)
-                    lat_max = max(lat_max, telemetry.position.lat)
-                    lng_min = min(lng_min, telemetry.position.lng)
-                    lng_max = max(lng_max, telemetry.position.lng)
-
-        # If there is no flight data yet, look at the center of where the data will be
-        if not data_exists:
-            lat = 0
-            lng = 0
-            n = 0
-            for injected_flight in self._injected_flights:
-                for telemetry in injected_flight.flight.telemetry:
-                    lat += telemetry.position.lat
-                    lng += telemetry.position.lng
-                    n += 1
-            lat_min = lat_max = lat / n
-            lng_min = lng_max = lng / n
+        ).timestamp()
+        t_max = t.timestamp()
+
+        # Flights are sorted by start time, so only a prefix can have started
+        n_started = np.searchsorted(self._flight_tmin, t_max, side="right")
+        candidates = np.nonzero(self._flight_tmax[:n_started] >= t_min)[0]
+        lat_mins, lat_maxs, lng_mins, lng_maxs = [], [], [], []
+        for i in candidates:
+            times = self._flight_times[i]
+            lo = np.searchsorted(times, t_min, side="left")
+            hi = np.searchsorted(times, t_max, side="right")
+            if lo < hi:
+                lats = self._flight_lats[i][lo:hi]
+                lngs = self._flight_lngs[i][lo:hi]
+                lat_mins.append(lats.min())
+                lat_maxs.append(lats.max())
+                lng_mins.append(lngs.min())
+                lng_maxs.append(lngs.max())
+
+        if lat_mins:
+            lat_min = float(min(lat_mins))
+            lat_max = float(max(lat_maxs))
+            lng_min = float(min(lng_mins))
+            lng_max = float(max(lng_maxs))
+        else:
+            # If there is no flight data yet, look at the center of where the data will be
+            lat_min = lat_max = self._lat_center
+            lng_min = lng_max = self._lng_center
 
         # Expand view size to meet minimum, if necessary
-        OVERSHOOT = 1.01
-        while True:
-            c1 = s2sphere.LatLng.from_degrees(lat_min, lng_min)
-            c2 = s2sphere.LatLng.from_degrees(lat_max, lng_max)
-            diagonal = (
-                c1.get_distance(c2).degrees * geo.EARTH_CIRCUMFERENCE_KM * 1000 / 360
-            )
-            if diagonal >= self._config.min_query_diagonal:
-                break
+        diagonal = _diagonal_m(lat_min, lng_min, lat_max, lng_max)
+        if diagonal < self._config.min_query_diagonal:
             if lat_min == lat_max and lng_min == lng_max:
                 lat_min -= 1e-5
                 lat_max += 1e-5
                 lng_min -= 1e-5
                 lng_max += 1e-5
-                continue
+                diagonal = _diagonal_m(lat_min, lng_min, lat_max, lng_max)
+
+            # At these scales the diagonal is effectively linear in the view's
+            # spans, so a single scaling (with a little overshoot) suffices.
+            # Never shrink a view that the widening above already made large
+            # enough.
+            OVERSHOOT = 1.01
+            scale = max(1.0, self._config.min_query_diagonal / diagonal * OVERSHOOT)
             lat_center = 0.5 * (lat_min + lat_max)
-            lat_span = (
-                (lat_max - lat_min)
-                * self._config.min_query_diagonal
-                / diagonal
-                * OVERSHOOT
-            )
+            lat_span = (lat_max - lat_min) * scale
             lat_min = lat_center - 0.5 * lat_span
             lat_max = lat_center + 0.5 * lat_span
             lng_center = 0.5 * (lng_min + lng_max)
-            lng_span = (
-                (lng_max - lng_min)
-                * self._config.min_query_diagonal
-                / diagonal
-                * OVERSHOOT
-            )
+            lng_span = (lng_max - lng_min) * scale
             lng_min = lng_center - 0.5 * lng_span
             lng_max = lng_center + 0.5 * lng_span
 
@@ -174,32 +252,32 @@ class RIDObservationEvaluator(object):
         """
 
         # Compute the end of all injected data
-        t_end = arrow.utcnow()
-        for injected_flight in self._injected_flights:
-            for telemetry in injected_flight.flight.telemetry:
-                t = arrow.get(telemetry.timestamp)
-                t_end = max(t_end, t)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        t_end = max(now, self._t_end_global)
         t_end += (
             self._rid_version.realtime_period
             + self._config.max_propagation_latency.timedelta
         )
 
-        if arrow.utcnow() > t_end:
+        if now > t_end:
             raise RuntimeError(
                 "Cannot evaluate system: injected test flights ended at {}, which is before now ({})".format(
-                    t_end, datetime.datetime.utcnow()
+                    t_end, now
                 )
             )
 
         query_counter = 0
         last_rect = None
+        reported_issue_count = len(self.findings.issues)
 
-        t_next = arrow.utcnow()
+        t_next = now
 
-        while arrow.utcnow() < t_end:
+        # Only read the clock after observing and after sleeping; all other
+        # comparisons within an iteration reuse that value
+        while now < t_end:
             # Evaluate the system at an instant in time
 
-            t_now = arrow.utcnow().datetime
+            t_now = now
             if (
                 last_rect
                 and self._config.repeat_query_rect_period > 0
@@ -212,17 +290,30 @@ class RIDObservationEvaluator(object):
                 )
                 last_rect = rect
             self._evaluate_system_instantaneously(observers, rect)
-            print("After observation at {}, {}".format(arrow.utcnow(), self.findings))
-            print(json.dumps(self.findings.issues, indent=2))
+            now = datetime.datetime.now(datetime.timezone.utc)
+            print(
+                "After observation at {}, {} issues from {} observation queries".format(
+                    now,
+                    len(self.findings.issues),
+                    len(self.findings.observation_queries),
+                )
+            )
+
+            # Only print issues found since the previous observation
+            new_issues = self.findings.issues[reported_issue_count:]
+            if new_issues:
+                print(_dumps_indented(new_issues))
+            reported_issue_count = len(self.findings.issues)
 
             # Wait until minimum polling interval elapses
-            while t_next < arrow.utcnow():
+            while t_next < now:
                 t_next += self._config.min_polling_interval.timedelta
             if t_next > t_end:
                 break
-            delay = t_next - arrow.utcnow()
+            delay = t_next - now
             if delay.total_seconds() > 0:
                 time.sleep(delay.total_seconds())
+                now = datetime.datetime.now(datetime.timezone.utc)
             query_counter += 1
 
     def _evaluate_system_instantaneously(
@@ -277,29 +368,30 @@ class RIDObservationEvaluator(object):
             self.findings.add_observation_failure(observer.name, rect, query)
             return
 
+        observed_flights_by_id: Dict[str, List[observation_api.Flight]] = {}
+        for observed_flight in observation.flights:
+            observed_flights_by_id.setdefault(observed_flight.id, []).append(
+                observed_flight
+            )
+
         for expected_flight in self._injected_flights:
             t_initiated = query.request.timestamp
             t_response = query.response.reported
-            timestamps = [
-                arrow.get(t.timestamp) for t in expected_flight.flight.telemetry
-            ]
-            t_min = min(timestamps).datetime
-            t_max = max(timestamps).datetime
-
-            flight_id = expected_flight.flight.details_responses[
-                0
-            ].details.id  # TODO: Choose appropriate details rather than first
-            matching_flights = [
-                observed_flight
-                for observed_flight in observation.flights
-                if observed_flight.id == flight_id
-            ]
+
+            cache = self._flight_caches.get(id(expected_flight))
+            if cache is None:
+                # This flight has no telemetry to evaluate
+                continue
+            flight_id = cache.flight_id
+            t_min = cache.t_min
+            t_max = cache.t_max
+            matching_flights = observed_flights_by_id.get(flight_id, [])
             if len(matching_flights) > 1:
                 self.findings.add_duplicate_flights(
                     observer.name,
                     flight_id,
                     len(matching_flights),
-                    expected_flight.uss.name,
+                    cache.uss_name,
                     query,
                 )
 
@@ -311,7 +403,7 @@ class RIDObservationEvaluator(object):
                         flight_id,
                         t_min,
                         t_response,
-                        expected_flight.uss.name,
+                        cache.uss_name,
                         query,
                     )
                     continue
@@ -328,7 +420,7 @@ class RIDObservationEvaluator(object):
                         flight_id,
                         t_max,
                         t_initiated,
-                        expected_flight.uss.name,
+                        cache.uss_name,
                         query,
                     )
                     continue
@@ -343,7 +435,7 @@ class RIDObservationEvaluator(object):
                         observer.name,
                         expected_flight,
                         rect,
-                        expected_flight.uss.name,
+                        cache.uss_name,
                         query,
                     )
                     continue
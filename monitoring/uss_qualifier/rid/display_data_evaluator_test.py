@@ -0,0 +1,136 @@
+"""Unit tests for the display_data_evaluator module using pytest.
+
+Testing can be invoked from the command line using:
+`pytest [test_*|*_test.py file/filepath]`
+"""
+
+import datetime
+import random
+from typing import List
+
+import pytest
+
+from monitoring.monitorlib.rid_automated_testing.injection_api import TestFlight
+from monitoring.monitorlib.rid_common import RIDVersion
+from monitoring.monitorlib.typing import ImplicitDict
+from monitoring.uss_qualifier.rid.display_data_evaluator import (
+    RIDObservationEvaluator,
+)
+from monitoring.uss_qualifier.rid.reports import Findings
+from monitoring.uss_qualifier.rid.utils import (
+    EvaluationConfiguration,
+    InjectedFlight,
+    InjectionTargetConfiguration,
+)
+
+T0 = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+RID_VERSION = RIDVersion.f3411_19
+
+# Disable expansion of the query rect so it matches the bounds of the data
+CONFIG = ImplicitDict.parse(
+    {"min_query_diagonal": 0, "max_propagation_latency": "10s"},
+    EvaluationConfiguration,
+)
+
+
+def _make_flight(flight_id: str, states: List[dict]) -> InjectedFlight:
+    flight = ImplicitDict.parse(
+        {
+            "injection_id": flight_id,
+            "telemetry": states,
+            "details_responses": [
+                {"effective_after": T0.isoformat(), "details": {"id": flight_id}}
+            ],
+        },
+        TestFlight,
+    )
+    return InjectedFlight(
+        uss=InjectionTargetConfiguration(name="uss", injection_base_url="http://uss"),
+        flight=flight,
+    )
+
+
+def _make_state(t: datetime.datetime, lat: float, lng: float) -> dict:
+    return {
+        "timestamp": t.isoformat(),
+        "timestamp_accuracy": 0,
+        "position": {
+            "lat": lat,
+            "lng": lng,
+            "alt": 0,
+            "accuracy_h": "HAUnknown",
+            "accuracy_v": "VAUnknown",
+        },
+        "track": 0,
+        "speed": 0,
+        "speed_accuracy": "SAUnknown",
+        "vertical_speed": 0,
+    }
+
+
+def _make_random_flights(rng: random.Random) -> List[InjectedFlight]:
+    flights = []
+    for i in range(8):
+        start = rng.uniform(-100, 300)
+        # Telemetry is deliberately not in time order
+        states = [
+            _make_state(
+                T0 + datetime.timedelta(seconds=start + rng.uniform(0, 90)),
+                46 + rng.uniform(-0.05, 0.05),
+                7 + rng.uniform(-0.05, 0.05),
+            )
+            for _ in range(rng.randint(1, 40))
+        ]
+        flights.append(_make_flight("flight{}".format(i), states))
+    flights.append(_make_flight("empty", []))
+    return flights
+
+
+def _brute_force_bounds(flights: List[InjectedFlight], t: datetime.datetime):
+    t_min = t - RID_VERSION.realtime_period - CONFIG.max_propagation_latency.timedelta
+    points = [
+        (state.position.lat, state.position.lng)
+        for flight in flights
+        for state in flight.flight.telemetry
+    ]
+    in_window = [
+        (state.position.lat, state.position.lng)
+        for flight in flights
+        for state in flight.flight.telemetry
+        if t_min <= state.timestamp.datetime <= t
+    ]
+    if in_window:
+        lats = [lat for lat, _ in in_window]
+        lngs = [lng for _, lng in in_window]
+        return (min(lats), min(lngs), max(lats), max(lngs))
+    lat = sum(lat for lat, _ in points) / len(points)
+    lng = sum(lng for _, lng in points) / len(points)
+    return (lat, lng, lat, lng)
+
+
+def test_get_query_rect_matches_brute_force():
+    rng = random.Random(12345)
+    flights = _make_random_flights(rng)
+    evaluator = RIDObservationEvaluator(
+        Findings(issues=[], observation_queries=[]), flights, CONFIG, RID_VERSION
+    )
+    for _ in range(200):
+        t = T0 + datetime.timedelta(seconds=rng.uniform(-200, 500))
+        rect = evaluator._get_query_rect(t)
+        actual = (
+            rect.lo().lat().degrees,
+            rect.lo().lng().degrees,
+            rect.hi().lat().degrees,
+            rect.hi().lng().degrees,
+        )
+        expected = _brute_force_bounds(flights, t)
+        for a, e in zip(actual, expected):
+            assert abs(a - e) < 1e-9
+
+
+def test_evaluator_requires_telemetry():
+    flights = [_make_flight("empty1", []), _make_flight("empty2", [])]
+    with pytest.raises(ValueError):
+        RIDObservationEvaluator(
+            Findings(issues=[], observation_queries=[]), flights, CONFIG, RID_VERSION
+        )
@@ -65,14 +65,15 @@ def run_rid_tests(
     report = reports.Report(setup=reports.Setup(configuration=test_configuration))
 
     # Inject flights into all USSs
+    harnesses = [
+        TestHarness(auth_spec=auth_spec, injection_base_url=target.injection_base_url)
+        for target in test_configuration.injection_targets
+    ]
+    all_injections = aircraft_state_replayer.submit_tests(
+        harnesses, test_payloads, test_id, report.setup
+    )
     injected_flights = []
-    for i, target in enumerate(test_configuration.injection_targets):
-        uss_injection_harness = TestHarness(
-            auth_spec=auth_spec, injection_base_url=target.injection_base_url
-        )
-        injections = uss_injection_harness.submit_test(
-            test_payloads[i], test_id, report.setup
-        )
+    for target, injections in zip(test_configuration.injection_targets, all_injections):
         for flight in injections:
             injected_flights.append(InjectedFlight(uss=target, flight=flight))
 
@@ -81,12 +81,16 @@ class GridCellFlight(NamedTuple):
 class FlightDetails(ImplicitDict):
     """This object stores the metadata associated with generated flight, this data is shared as information in the remote id call"""
 
+    __slots__ = ()
+
     rid_details: RIDFlightDetails
     operator_name: str
     aircraft_type: str  # Generic type of aircraft https://github.com/uastech/standards/blob/36e7ea23a010ff91053f82ac4f6a9bfc698503f9/remoteid/canonical.yaml#L1711
 
 
 class FullFlightRecord(ImplicitDict):
+    __slots__ = ()
+
     reference_time: str
     states: List[RIDAircraftState]
     flight_details: FlightDetails